@@ -1,213 +1,463 @@
 import os
-import json
+import logging
+import asyncio
 import argparse
-import boto3
-from kubernetes import client, config
+import orjson
+from aiobotocore.session import get_session
+from kubernetes_asyncio import client, config
+from kubernetes_asyncio.client.rest import ApiException
 
-# Initialize AWS clients
-ssm_client = boto3.client("ssm")
-autoscaling_client = boto3.client("autoscaling")
+logger = logging.getLogger(__name__)
 
 # AWS SSM Parameter Names
 K8S_AWS_SSM_PARAMETER_NAME = "/kubernetes-aws-eks-auto-scaler/k8s-replica-counts"
 ASG_AWS_SSM_PARAMETER_NAME = "/kubernetes-aws-eks-auto-scaler/asg-config"
 
-def load_kubernetes_config():
+# Decoded AWS SSM parameter values fetched during this run, keyed by parameter name
+_ssm_parameter_cache = {}
+
+# Label set on the Kubernetes Deployments and StatefulSets scaled down by this tool, so that they can be skipped server-side
+SCALED_DOWN_LABEL = "kubernetes-aws-eks-auto-scaler/scaled-down"
+SCALED_DOWN_LABEL_SELECTOR = f"{SCALED_DOWN_LABEL}=true"
+NOT_SCALED_DOWN_LABEL_SELECTOR = f"{SCALED_DOWN_LABEL}!=true"
+
+# Value stored in AWS SSM for the Kubernetes CronJobs suspended during scale-down
+CRONJOB_SUSPENDED_STATE = "suspended"
+
+# AWS SSM parameter tier letting SSM pick the standard or the advanced tier per value size, without ever downgrading
+SSM_PARAMETER_TIER = "Intelligent-Tiering"
+
+# Content type of the JSON merge patches sent to the Kubernetes API. Deployments and StatefulSets are patched directly
+# instead of through their /scale subresource, so that the replicas and the scaled down label change in a single request
+MERGE_PATCH_CONTENT_TYPE = "application/merge-patch+json"
+
+# Maximum number of Kubernetes resources returned by a single LIST call
+K8S_LIST_PAGE_SIZE = 500
+
+# Maximum number of AWS Auto Scaling Groups returned by a single DescribeAutoScalingGroups call
+ASG_DESCRIBE_BATCH_SIZE = 100
+
+# Default maximum number of in-flight Kubernetes API requests
+DEFAULT_MAX_CONCURRENCY = 32
+
+# JMESPath projection keeping only the fields used from each described AWS Auto Scaling Group
+ASG_SIZES_EXPRESSION = "AutoScalingGroups[].{AutoScalingGroupName: AutoScalingGroupName, MinSize: MinSize, DesiredCapacity: DesiredCapacity, MaxSize: MaxSize}"
+
+# Maximum number of concurrent UpdateAutoScalingGroup calls
+ASG_MAX_CONCURRENCY = 8
+
+async def load_kubernetes_config():
     """Load Kubernetes configuration based on the environment."""
-    print("Loading Kubernetes configuration...")
+    logger.info("Loading Kubernetes configuration...")
     try:
         if "KUBERNETES_SERVICE_HOST" in os.environ:
-            print("Detected in-cluster environment.")
+            logger.info("Detected in-cluster environment.")
             config.load_incluster_config()
         else:
-            print("Detected local environment. Using kubeconfig.")
-            config.load_kube_config()
-        print("Kubernetes configuration loaded successfully.")
+            logger.info("Detected local environment. Using kubeconfig.")
+            await config.load_kube_config()
+        logger.info("Kubernetes configuration loaded successfully.")
     except Exception as e:
-        print(f"Error loading Kubernetes configuration: {e}")
+        logger.error("Error loading Kubernetes configuration: %s", e)
         raise
 
-def filter_excluded_k8s_resources(kind, resources, exclude_list):
-    """Remove Kubernetes resources that are in the exclude list."""
-    if not exclude_list:
-        print(f"No Kubernetes resources of kind '{kind}' to exclude.")
+async def gather_limited(semaphore, coroutines, return_exceptions=False):
+    """Run coroutines concurrently while keeping at most as many in flight as the semaphore allows."""
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*[run(coroutine) for coroutine in coroutines], return_exceptions=return_exceptions)
+
+async def iter_k8s_resource_pages(list_function, **kwargs):
+    """Yield the items of a Kubernetes LIST call one page at a time."""
+    continue_token = None
+    while True:
+        response = await list_function(limit=K8S_LIST_PAGE_SIZE, _continue=continue_token, **kwargs)
+        yield response.items
+        continue_token = response.metadata._continue
+        if not continue_token:
+            break
+
+async def fetch_k8s_resources(semaphore, kind, k8s_resources, read_function):
+    """Fetch specific Kubernetes resources of a kind concurrently, skipping the ones that do not exist."""
+    keys = {(res["namespace"], res["name"]) for res in k8s_resources if res["kind"].lower() == kind.lower()}
+
+    async def fetch_resource(namespace, name):
+        try:
+            return await read_function(name, namespace)
+        except ApiException as e:
+            if e.status != 404:
+                raise
+            logger.warning("%s '%s' not found in namespace '%s'.", kind, name, namespace)
+            return None
+
+    # Let every read settle before raising, so that no read is left running on a closing session
+    results = await gather_limited(semaphore, [fetch_resource(namespace, name) for namespace, name in keys], return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return [res for res in results if res is not None]
+
+def filter_excluded_k8s_resources(kind, resources, exclude_set):
+    """Remove Kubernetes resources whose (namespace, kind, name) key is in the exclude set."""
+    if not exclude_set:
+        logger.debug("No Kubernetes resources of kind '%s' to exclude.", kind)
         return resources
 
-    print(f"Excluding the following Kubernetes resources: {exclude_list}")
-    exclude_set = {(res["namespace"], res["kind"].lower(), res["name"]) for res in exclude_list}
-
     filtered_resources = [
         res for res in resources
         if (res.metadata.namespace, kind.lower(), res.metadata.name) not in exclude_set
     ]
 
-    print(f"Remaining Kubernetes resources after exclusion: {[f'{res.kind}/{res.metadata.namespace}/{res.metadata.name}' for res in filtered_resources]}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Remaining Kubernetes resources after exclusion: %s", [f"{kind.lower()}/{res.metadata.namespace}/{res.metadata.name}" for res in filtered_resources])
     return filtered_resources
 
 def filter_excluded_asgs(asg_list, exclude_list):
     """Remove AWS Auto Scaling Groups that are in the exclude list."""
     if not exclude_list:
-        print("No AWS Auto Scaling Groups to exclude.")
+        logger.debug("No AWS Auto Scaling Groups to exclude.")
         return asg_list
 
-    print(f"Excluding the following AWS Auto Scaling Groups: {exclude_list}")
-    filtered_asgs = [asg for asg in asg_list if asg not in exclude_list]
+    logger.debug("Excluding the following AWS Auto Scaling Groups: %s", exclude_list)
+    exclude_set = set(exclude_list)
+    filtered_asgs = [asg for asg in asg_list if asg not in exclude_set]
 
-    print(f"Remaining AWS Auto Scaling Groups after exclusion: {filtered_asgs}")
+    logger.debug("Remaining AWS Auto Scaling Groups after exclusion: %s", filtered_asgs)
     return filtered_asgs
 
-def update_ssm_parameter(ssm_client, parameter_name, new_data):
+async def describe_asgs(autoscaling_client, asg_names=None):
+    """Describe AWS Auto Scaling Groups in bulk and return their name and sizes keyed by name."""
+    paginator = autoscaling_client.get_paginator("describe_auto_scaling_groups")
+    if not asg_names:
+        batches = [{}]
+    else:
+        batches = [{"AutoScalingGroupNames": asg_names[i:i + ASG_DESCRIBE_BATCH_SIZE]} for i in range(0, len(asg_names), ASG_DESCRIBE_BATCH_SIZE)]
+
+    asgs = {}
+    for batch in batches:
+        async for asg in paginator.paginate(**batch, PaginationConfig={"PageSize": ASG_DESCRIBE_BATCH_SIZE}).search(ASG_SIZES_EXPRESSION):
+            asgs[asg["AutoScalingGroupName"]] = asg
+    return asgs
+
+async def update_asgs(autoscaling_client, asg_configs):
+    """Update AWS Auto Scaling Groups concurrently and return the errors keyed by AWS Auto Scaling Group name."""
+    results = await gather_limited(asyncio.Semaphore(ASG_MAX_CONCURRENCY), [
+        autoscaling_client.update_auto_scaling_group(AutoScalingGroupName=asg_name, **asg_config)
+        for asg_name, asg_config in asg_configs.items()
+    ], return_exceptions=True)
+
+    errors = {asg_name: result for asg_name, result in zip(asg_configs, results) if isinstance(result, Exception)}
+    for asg_name, error in errors.items():
+        logger.error("Error updating AWS Auto Scaling Group '%s': %s", asg_name, error)
+    return errors
+
+async def get_ssm_parameter(ssm_client, parameter_name):
+    """Fetch and decode an AWS SSM parameter once per run, returning None if it does not exist."""
+    if parameter_name not in _ssm_parameter_cache:
+        try:
+            _ssm_parameter_cache[parameter_name] = orjson.loads((await ssm_client.get_parameter(Name=parameter_name))["Parameter"]["Value"])
+            logger.debug("Fetched AWS SSM parameter %s.", parameter_name)
+        except ssm_client.exceptions.ParameterNotFound:
+            _ssm_parameter_cache[parameter_name] = None
+    return _ssm_parameter_cache[parameter_name]
+
+async def update_ssm_parameter(ssm_client, parameter_name, new_data):
     """Update AWS SSM parameter while preserving existing keys."""
-    print(f"Updating AWS SSM parameter: {parameter_name}")
-    try:
-        existing_data = json.loads(ssm_client.get_parameter(Name=parameter_name)["Parameter"]["Value"])
-        print("Fetched existing AWS SSM data.")
-    except ssm_client.exceptions.ParameterNotFound:
-        print("No existing AWS SSM data found. Initializing new parameter.")
+    logger.info("Updating AWS SSM parameter: %s", parameter_name)
+    existing_data = await get_ssm_parameter(ssm_client, parameter_name)
+    if existing_data is None:
+        logger.info("No existing AWS SSM data found. Initializing new parameter.")
         existing_data = {}
-
-    existing_data.update(new_data)
-    ssm_client.put_parameter(Name=parameter_name, Value=json.dumps(existing_data), Type="String", Overwrite=True)
-    print(f"AWS SSM parameter {parameter_name} updated successfully.")
-
-def scale_down(k8s_resources, aws_asg_resources, exclude_k8s_resources, exclude_aws_asg_resources):
-    """Scale down Kubernetes resources and AWS Auto Scaling Groups."""
-    print("Scaling down Kubernetes resources and AWS Auto Scaling Groups...")
-    k8s_client = client.AppsV1Api()
-    batch_client = client.BatchV1Api()
-
-    # Fetch K8s resources
-    if not k8s_resources:
-        print("Fetching all Deployments, StatefulSets, and CronJobs...")
-        all_deployments = k8s_client.list_deployment_for_all_namespaces().items
-        all_statefulsets = k8s_client.list_stateful_set_for_all_namespaces().items
-        all_cronjobs = batch_client.list_cron_job_for_all_namespaces().items
     else:
-        print(f"Scaling down specific Kubernetes resources: {k8s_resources}")
-        all_deployments = [k8s_client.read_namespaced_deployment(res["name"], res["namespace"]) for res in k8s_resources if res["kind"].lower() == "deployment"]
-        all_statefulsets = [k8s_client.read_namespaced_stateful_set(res["name"], res["namespace"]) for res in k8s_resources if res["kind"].lower() == "statefulset"]
-        all_cronjobs = [batch_client.read_namespaced_cron_job(res["name"], res["namespace"]) for res in k8s_resources if res["kind"].lower() == "cronjob"]
+        existing_data = dict(existing_data)
 
-    # Exclude specified K8s resources
-    all_deployments = filter_excluded_k8s_resources("Deployment", all_deployments, exclude_k8s_resources)
-    all_statefulsets = filter_excluded_k8s_resources("StatefulSet", all_statefulsets, exclude_k8s_resources)
-    all_cronjobs = filter_excluded_k8s_resources("CronJob", all_cronjobs, exclude_k8s_resources)
+    existing_data.update(new_data)
+    await put_ssm_parameter(ssm_client, parameter_name, existing_data)
+
+async def remove_ssm_parameter_keys(ssm_client, parameter_name, keys):
+    """Remove keys from an AWS SSM parameter while preserving the other keys."""
+    existing_data = await get_ssm_parameter(ssm_client, parameter_name)
+    if not existing_data or not any(key in existing_data for key in keys):
+        return
+
+    logger.info("Removing restored entries from AWS SSM parameter: %s", parameter_name)
+    keys = set(keys)
+    await put_ssm_parameter(ssm_client, parameter_name, {key: value for key, value in existing_data.items() if key not in keys})
+
+async def put_ssm_parameter(ssm_client, parameter_name, data):
+    """Write the data to an AWS SSM parameter, letting SSM move it to the advanced tier if it does not fit in a standard one."""
+    await ssm_client.put_parameter(Name=parameter_name, Value=orjson.dumps(data).decode(), Type="String", Tier=SSM_PARAMETER_TIER, Overwrite=True)
+    _ssm_parameter_cache[parameter_name] = data
+    logger.info("AWS SSM parameter %s updated successfully.", parameter_name)
+
+async def restore_k8s_resource(k8s_client, batch_client, key, value):
+    """Restore the replica count of a single Kubernetes Deployment or StatefulSet or resume a single Kubernetes CronJob."""
+    kind, namespace, name = key.split("/")
+    logger.info("Restoring '%s' '%s' in namespace %s", kind.capitalize(), name, namespace)
+    if kind == "deployment":
+        await k8s_client.patch_namespaced_deployment(name, namespace, {"metadata": {"labels": {SCALED_DOWN_LABEL: None}}, "spec": {"replicas": value}}, _content_type=MERGE_PATCH_CONTENT_TYPE)
+    elif kind == "statefulset":
+        await k8s_client.patch_namespaced_stateful_set(name, namespace, {"metadata": {"labels": {SCALED_DOWN_LABEL: None}}, "spec": {"replicas": value}}, _content_type=MERGE_PATCH_CONTENT_TYPE)
+    elif kind == "cronjob" and value == CRONJOB_SUSPENDED_STATE:
+        await batch_client.patch_namespaced_cron_job(name, namespace, {"spec": {"suspend": False}}, _content_type=MERGE_PATCH_CONTENT_TYPE)
+
+def build_k8s_scale_down_patches(k8s_client, batch_client, kind, resources):
+    """Build the patches scaling down Kubernetes resources of a kind, skipping the ones already scaled down."""
+    patches = []
+    for res in resources:
+        name, namespace = res.metadata.name, res.metadata.namespace
+        if kind == "CronJob":
+            if namespace == "kubernetes-aws-eks-auto-scaler":
+                continue
+            if not res.spec.suspend:
+                logger.info("Suspending CronJob '%s' in namespace '%s'", name, namespace)
+                patches.append((f"cronjob/{namespace}/{name}", CRONJOB_SUSPENDED_STATE, batch_client.patch_namespaced_cron_job(name, namespace, {"spec": {"suspend": True}}, _content_type=MERGE_PATCH_CONTENT_TYPE)))
+            else:
+                logger.debug("CronJob '%s' in namespace '%s' has already been suspended.", name, namespace)
+        elif res.spec.replicas > 0:
+            logger.info("Scaling down %s '%s' in namespace '%s'", kind, name, namespace)
+            patch_function = k8s_client.patch_namespaced_deployment if kind == "Deployment" else k8s_client.patch_namespaced_stateful_set
+            patches.append((f"{kind.lower()}/{namespace}/{name}", res.spec.replicas, patch_function(name, namespace, {"metadata": {"labels": {SCALED_DOWN_LABEL: "true"}}, "spec": {"replicas": 0}}, _content_type=MERGE_PATCH_CONTENT_TYPE)))
+        else:
+            logger.debug("%s '%s' in namespace '%s' has already scaled down to zero.", kind, name, namespace)
+    return patches
+
+async def scale_down_k8s_resources(k8s_client, batch_client, k8s_semaphore, ssm_client, k8s_resources, exclude_k8s_resources):
+    """Scale down Kubernetes resources."""
+    exclude_set = {(res["namespace"], res["kind"].lower(), res["name"]) for res in exclude_k8s_resources or []}
+    if exclude_set:
+        logger.debug("Excluding the following Kubernetes resources: %s", exclude_k8s_resources)
+
+    # Drop the specific K8s resources that are excluded anyway before fetching them
+    if k8s_resources and exclude_set:
+        k8s_resources = [res for res in k8s_resources if (res["namespace"], res["kind"].lower(), res["name"]) not in exclude_set]
+        if not k8s_resources:
+            logger.info("All specific Kubernetes resources are excluded. No Kubernetes resources to scale down.")
+            return
 
-    # Scale down K8s resources
     k8s_scaling_data = {}
-    for deployment in all_deployments:
-        if deployment.spec.replicas > 0:
-            print(f"Scaling down Deployment '{deployment.metadata.name}' in namespace '{deployment.metadata.namespace}'")
-            k8s_scaling_data[f"deployment/{deployment.metadata.namespace}/{deployment.metadata.name}"] = deployment.spec.replicas
-            deployment.spec.replicas = 0
-            k8s_client.patch_namespaced_deployment(deployment.metadata.name, deployment.metadata.namespace, deployment)
-        else:
-            print(f"Deployment '{deployment.metadata.name}' in namespace '{deployment.metadata.namespace}' has already scaled down to zero.")
-
-    for statefulset in all_statefulsets:
-        if statefulset.spec.replicas > 0:
-            print(f"Scaling down StatefulSet '{statefulset.metadata.name}' in namespace '{statefulset.metadata.namespace}'")
-            k8s_scaling_data[f"statefulset/{statefulset.metadata.namespace}/{statefulset.metadata.name}"] = statefulset.spec.replicas
-            statefulset.spec.replicas = 0
-            k8s_client.patch_namespaced_stateful_set(statefulset.metadata.name, statefulset.metadata.namespace, statefulset)
+    k8s_errors = []
+
+    async def scale_down_batch(kind, resources):
+        # Exclude specified K8s resources
+        resources = filter_excluded_k8s_resources(kind, resources, exclude_set)
+
+        # Send the K8s patches of the batch concurrently and only keep the data of the successful ones
+        patches = build_k8s_scale_down_patches(k8s_client, batch_client, kind, resources)
+        results = await gather_limited(k8s_semaphore, [patch for _, _, patch in patches], return_exceptions=True)
+        for (key, value, _), result in zip(patches, results):
+            if isinstance(result, Exception):
+                logger.error("Error scaling down Kubernetes resource '%s': %s", key, result)
+                k8s_errors.append(result)
+            else:
+                k8s_scaling_data[key] = value
+
+    # Fetch and scale down K8s resources, storing the K8s data of the scaled down ones even if a LIST call fails
+    try:
+        if not k8s_resources:
+            logger.info("Fetching all Deployments, StatefulSets, and CronJobs...")
+
+            async def scale_down_kind(kind, list_function, **list_args):
+                async for page in iter_k8s_resource_pages(list_function, **list_args):
+                    await scale_down_batch(kind, page)
+
+            # The kinds are streamed concurrently and share the semaphore, each one page by page
+            results = await asyncio.gather(
+                scale_down_kind("Deployment", k8s_client.list_deployment_for_all_namespaces, label_selector=NOT_SCALED_DOWN_LABEL_SELECTOR),
+                scale_down_kind("StatefulSet", k8s_client.list_stateful_set_for_all_namespaces, label_selector=NOT_SCALED_DOWN_LABEL_SELECTOR),
+                scale_down_kind("CronJob", batch_client.list_cron_job_for_all_namespaces),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
         else:
-            print(f"StatefulSet '{statefulset.metadata.name}' in namespace '{statefulset.metadata.namespace}' has already scaled down to zero.")
-
-    for cronjob in all_cronjobs:
-        if cronjob.metadata.namespace != "kubernetes-aws-eks-auto-scaler":
-            print(f"Suspending CronJob '{cronjob.metadata.name}' in namespace '{cronjob.metadata.namespace}'")
-            cronjob.spec.suspend = True
-            batch_client.patch_namespaced_cron_job(cronjob.metadata.name, cronjob.metadata.namespace, cronjob)
-
-    # Store K8s data
-    if k8s_scaling_data:
-        update_ssm_parameter(ssm_client, K8S_AWS_SSM_PARAMETER_NAME, k8s_scaling_data)
-
+            logger.info("Scaling down specific Kubernetes resources: %s", k8s_resources)
+            results = await asyncio.gather(
+                fetch_k8s_resources(k8s_semaphore, "Deployment", k8s_resources, k8s_client.read_namespaced_deployment),
+                fetch_k8s_resources(k8s_semaphore, "StatefulSet", k8s_resources, k8s_client.read_namespaced_stateful_set),
+                fetch_k8s_resources(k8s_semaphore, "CronJob", k8s_resources, batch_client.read_namespaced_cron_job),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+            all_deployments, all_statefulsets, all_cronjobs = results
+            await asyncio.gather(
+                scale_down_batch("Deployment", all_deployments),
+                scale_down_batch("StatefulSet", all_statefulsets),
+                scale_down_batch("CronJob", all_cronjobs),
+            )
+    finally:
+        # Store K8s data
+        if k8s_scaling_data:
+            await update_ssm_parameter(ssm_client, K8S_AWS_SSM_PARAMETER_NAME, k8s_scaling_data)
+    if k8s_errors:
+        raise k8s_errors[0]
+
+async def scale_down_asgs(autoscaling_client, ssm_client, aws_asg_resources, exclude_aws_asg_resources):
+    """Scale down AWS Auto Scaling Groups."""
     # Fetch AWS ASGs
+    asgs = None
     if not aws_asg_resources:
-        print("Fetching all AWS Auto Scaling Groups...")
-        asg_response = autoscaling_client.describe_auto_scaling_groups()
-        aws_asg_resources = [asg["AutoScalingGroupName"] for asg in asg_response["AutoScalingGroups"]]
+        logger.info("Fetching all AWS Auto Scaling Groups...")
+        asgs = await describe_asgs(autoscaling_client)
+        aws_asg_resources = list(asgs)
 
     # Exclude specified AWS ASGs
     aws_asg_resources = filter_excluded_asgs(aws_asg_resources, exclude_aws_asg_resources)
+    if aws_asg_resources and asgs is None:
+        logger.info("Fetching AWS Auto Scaling Groups: %s", aws_asg_resources)
+        asgs = await describe_asgs(autoscaling_client, aws_asg_resources)
 
     # Scale down AWS ASGs
     asg_scaling_data = {}
     for asg_name in aws_asg_resources:
-        asg = autoscaling_client.describe_auto_scaling_groups(AutoScalingGroupNames=[asg_name])["AutoScalingGroups"][0]
+        asg = asgs.get(asg_name)
+        if asg is None:
+            logger.warning("AWS Auto Scaling Group '%s' not found.", asg_name)
+            continue
         if asg["MinSize"] > 0 or asg["DesiredCapacity"] != 0 or asg["MaxSize"] != 0:
-            print(f"Scaling down AWS Auto Scaling Group '{asg_name}'")
+            logger.info("Scaling down AWS Auto Scaling Group '%s'", asg_name)
             asg_scaling_data[asg_name] = {"MinSize": asg["MinSize"], "DesiredCapacity": asg["DesiredCapacity"], "MaxSize": asg["MaxSize"]}
-            autoscaling_client.update_auto_scaling_group(AutoScalingGroupName=asg_name, MinSize=0, DesiredCapacity=0, MaxSize=0)
         else:
-            print(f"AWS Auto Scaling Group '{asg_name}' has already scaled down to zero.")
+            logger.debug("AWS Auto Scaling Group '%s' has already scaled down to zero.", asg_name)
+    asg_errors = await update_asgs(autoscaling_client, {asg_name: {"MinSize": 0, "DesiredCapacity": 0, "MaxSize": 0} for asg_name in asg_scaling_data})
+    asg_scaling_data = {asg_name: asg_config for asg_name, asg_config in asg_scaling_data.items() if asg_name not in asg_errors}
 
     # Store AWS ASGs data
     if asg_scaling_data:
-        update_ssm_parameter(ssm_client, ASG_AWS_SSM_PARAMETER_NAME, asg_scaling_data)
+        await update_ssm_parameter(ssm_client, ASG_AWS_SSM_PARAMETER_NAME, asg_scaling_data)
+    if asg_errors:
+        raise next(iter(asg_errors.values()))
 
-def scale_up():
+async def scale_down(k8s_client, batch_client, k8s_semaphore, autoscaling_client, ssm_client, k8s_resources, aws_asg_resources, exclude_k8s_resources, exclude_aws_asg_resources):
+    """Scale down Kubernetes resources and AWS Auto Scaling Groups."""
+    logger.info("Scaling down Kubernetes resources and AWS Auto Scaling Groups...")
+    # Both halves run concurrently and each one stores its own data before the first error is raised
+    results = await asyncio.gather(
+        scale_down_k8s_resources(k8s_client, batch_client, k8s_semaphore, ssm_client, k8s_resources, exclude_k8s_resources),
+        scale_down_asgs(autoscaling_client, ssm_client, aws_asg_resources, exclude_aws_asg_resources),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+async def scale_up_asgs(autoscaling_client, ssm_client):
+    """Scale up AWS Auto Scaling Groups."""
+    logger.info("Fetching stored AWS Auto Scaling Group configurations...")
+    asg_scaling_data = await get_ssm_parameter(ssm_client, ASG_AWS_SSM_PARAMETER_NAME)
+    if asg_scaling_data is None:
+        logger.info("No stored AWS Auto Scaling Group configurations found.")
+        return
+
+    for asg_name in asg_scaling_data:
+        logger.info("Restoring AWS Auto Scaling Group '%s'", asg_name)
+    asg_errors = await update_asgs(autoscaling_client, {asg_name: {"MinSize": config["MinSize"], "DesiredCapacity": config["DesiredCapacity"], "MaxSize": config["MaxSize"]} for asg_name, config in asg_scaling_data.items()})
+    if asg_errors:
+        raise next(iter(asg_errors.values()))
+
+async def scale_up_k8s_resources(k8s_client, batch_client, k8s_semaphore, ssm_client):
+    """Scale up Kubernetes resources."""
+    logger.info("Fetching stored Kubernetes configurations...")
+    k8s_scaling_data = await get_ssm_parameter(ssm_client, K8S_AWS_SSM_PARAMETER_NAME)
+    if k8s_scaling_data is None:
+        logger.info("No stored Kubernetes configurations found.")
+        k8s_scaling_data = {}
+
+    # Restore every K8s resource before raising, so that one failing resource does not leave the others at zero
+    results = await gather_limited(k8s_semaphore, [restore_k8s_resource(k8s_client, batch_client, key, value) for key, value in k8s_scaling_data.items()], return_exceptions=True)
+    k8s_errors = []
+    restored_keys = []
+    for key, result in zip(k8s_scaling_data, results):
+        if isinstance(result, Exception):
+            logger.error("Error restoring Kubernetes resource '%s': %s", key, result)
+            k8s_errors.append(result)
+        else:
+            restored_keys.append(key)
+
+    # Forget the restored K8s resources, so that a stale entry never restores a resource suspended or scaled down on purpose later
+    await remove_ssm_parameter_keys(ssm_client, K8S_AWS_SSM_PARAMETER_NAME, restored_keys)
+
+    k8s_errors += await clear_stale_scaled_down_labels(k8s_client, k8s_semaphore, k8s_scaling_data.keys())
+    if k8s_errors:
+        raise k8s_errors[0]
+
+async def clear_stale_scaled_down_labels(k8s_client, k8s_semaphore, stored_keys):
+    """Remove the scaled down label from Kubernetes Deployments and StatefulSets without a stored replica count and return the errors."""
+    errors = []
+
+    async def clear_kind(kind, list_function, patch_function):
+        async for page in iter_k8s_resource_pages(list_function, label_selector=SCALED_DOWN_LABEL_SELECTOR):
+            resources = [res for res in page if f"{kind.lower()}/{res.metadata.namespace}/{res.metadata.name}" not in stored_keys]
+            for res in resources:
+                logger.warning("%s '%s' in namespace '%s' is labelled as scaled down but has no stored replica count. Removing the label only.", kind, res.metadata.name, res.metadata.namespace)
+            results = await gather_limited(k8s_semaphore, [
+                patch_function(res.metadata.name, res.metadata.namespace, {"metadata": {"labels": {SCALED_DOWN_LABEL: None}}}, _content_type=MERGE_PATCH_CONTENT_TYPE)
+                for res in resources
+            ], return_exceptions=True)
+            for res, result in zip(resources, results):
+                if isinstance(result, Exception):
+                    logger.error("Error removing the scaled down label from %s '%s' in namespace '%s': %s", kind, res.metadata.name, res.metadata.namespace, result)
+                    errors.append(result)
+
+    # A failing LIST is returned with the other errors instead of being raised while the other kind is still patching
+    results = await asyncio.gather(
+        clear_kind("Deployment", k8s_client.list_deployment_for_all_namespaces, k8s_client.patch_namespaced_deployment),
+        clear_kind("StatefulSet", k8s_client.list_stateful_set_for_all_namespaces, k8s_client.patch_namespaced_stateful_set),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Error listing Kubernetes resources labelled as scaled down: %s", result)
+            errors.append(result)
+    return errors
+
+async def scale_up(k8s_client, batch_client, k8s_semaphore, autoscaling_client, ssm_client):
     """Scale up Kubernetes resources and AWS Auto Scaling Groups."""
-    print("Scaling up Kubernetes resources and AWS Auto Scaling Groups...")
-    k8s_client = client.AppsV1Api()
-    batch_client = client.BatchV1Api()
-
-    # Restore AWS ASGs
-    try:
-        print("Fetching stored AWS Auto Scaling Group configurations...")
-        asg_scaling_data = json.loads(ssm_client.get_parameter(Name=ASG_AWS_SSM_PARAMETER_NAME)["Parameter"]["Value"])
-        for asg_name, config in asg_scaling_data.items():
-            print(f"Restoring AWS Auto Scaling Group '{asg_name}'")
-            autoscaling_client.update_auto_scaling_group(AutoScalingGroupName=asg_name, MinSize=config["MinSize"], DesiredCapacity=config["DesiredCapacity"], MaxSize=config["MaxSize"])
-    except ssm_client.exceptions.ParameterNotFound:
-        print("No stored AWS Auto Scaling Group configurations found.")
-
-    # Restore K8s resources
-    try:
-        print("Fetching stored Kubernetes configurations...")
-        k8s_scaling_data = json.loads(ssm_client.get_parameter(Name=K8S_AWS_SSM_PARAMETER_NAME)["Parameter"]["Value"])
-        for key, replicas in k8s_scaling_data.items():
-            kind, namespace, name = key.split("/")
-            print(f"Restoring '{kind.capitalize()}' '{name}' in namespace {namespace}")
-            if kind == "deployment":
-                deployment = k8s_client.read_namespaced_deployment(name, namespace)
-                deployment.spec.replicas = replicas
-                k8s_client.patch_namespaced_deployment(name, namespace, deployment)
-            elif kind == "statefulset":
-                statefulset = k8s_client.read_namespaced_stateful_set(name, namespace)
-                statefulset.spec.replicas = replicas
-                k8s_client.patch_namespaced_stateful_set(name, namespace, statefulset)
-    except ssm_client.exceptions.ParameterNotFound:
-        print("No stored Kubernetes configurations found.")
-
-    # Resume CronJobs
-    print("Resuming suspended CronJobs...")
-    cronjobs = batch_client.list_cron_job_for_all_namespaces().items
-    for cronjob in cronjobs:
-        if cronjob.metadata.namespace != "kubernetes-aws-eks-auto-scaler":
-            print(f"Resuming CronJob '{cronjob.metadata.name}' in namespace '{cronjob.metadata.namespace}'")
-            cronjob.spec.suspend = False
-            batch_client.patch_namespaced_cron_job(cronjob.metadata.name, cronjob.metadata.namespace, cronjob)
-
-def main():
-    print("Starting script execution...")
-    load_kubernetes_config()
+    logger.info("Scaling up Kubernetes resources and AWS Auto Scaling Groups...")
+    # Pods restored before their nodes are back stay pending until the AWS Auto Scaling Groups have scaled up
+    results = await asyncio.gather(
+        scale_up_asgs(autoscaling_client, ssm_client),
+        scale_up_k8s_resources(k8s_client, batch_client, k8s_semaphore, ssm_client),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+async def main():
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), format="%(asctime)s %(levelname)s %(message)s")
+    logger.info("Starting script execution...")
+    await load_kubernetes_config()
 
     parser = argparse.ArgumentParser(description="Scale Kubernetes resources and AWS EKS node groups.")
     parser.add_argument("action", choices=["scale-down", "scale-up"], help="Action to perform. It can be either \"scale-down\" or \"scale-up\".")
-    parser.add_argument("--k8s-resources", type=json.loads, help="List of Kubernetes resources to be considered, in JSON format. (e.g., [{\"namespace\": \"default\", \"kind\": \"deployment\", \"name\": \"example-deployment\"}])")
-    parser.add_argument("--exclude-k8s-resources", type=json.loads, help="List of Kubernetes resources to be excluded, in JSON format. (e.g., [{\"namespace\": \"default\", \"kind\": \"deployment\", \"name\": \"example-deployment\"}])")
+    parser.add_argument("--k8s-resources", type=orjson.loads, help="List of Kubernetes resources to be considered, in JSON format. (e.g., [{\"namespace\": \"default\", \"kind\": \"deployment\", \"name\": \"example-deployment\"}])")
+    parser.add_argument("--exclude-k8s-resources", type=orjson.loads, help="List of Kubernetes resources to be excluded, in JSON format. (e.g., [{\"namespace\": \"default\", \"kind\": \"deployment\", \"name\": \"example-deployment\"}])")
     parser.add_argument("--aws-asg-resources", nargs='*', help="List of AWS Auto Scaling Groups to be considered. (e.g., aws-asg-example-1, aws-asg-example-2)")
     parser.add_argument("--exclude-aws-asg-resources", nargs='*', help="List of AWS Auto Scaling Groups to be excluded. (e.g., aws-asg-example-1, aws-asg-example-2)")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY, help=f"Maximum number of concurrent Kubernetes API requests. (default: {DEFAULT_MAX_CONCURRENCY})")
 
     args = parser.parse_args()
-
-    if args.action == "scale-down":
-        scale_down(args.k8s_resources, args.aws_asg_resources, args.exclude_k8s_resources, args.exclude_aws_asg_resources)
-    elif args.action == "scale-up":
-        scale_up()
-    print("Script execution finished!")
+    if args.max_concurrency < 1:
+        parser.error("--max-concurrency must be at least 1.")
+
+    # A single Kubernetes API client (and its connection pool) is shared by all API groups for the whole run,
+    # next to the AWS clients, so that all requests run on the same event loop
+    session = get_session()
+    async with client.ApiClient() as api_client, session.create_client("ssm") as ssm_client, session.create_client("autoscaling") as autoscaling_client:
+        k8s_client = client.AppsV1Api(api_client)
+        batch_client = client.BatchV1Api(api_client)
+        k8s_semaphore = asyncio.Semaphore(args.max_concurrency)
+        if args.action == "scale-down":
+            await scale_down(k8s_client, batch_client, k8s_semaphore, autoscaling_client, ssm_client, args.k8s_resources, args.aws_asg_resources, args.exclude_k8s_resources, args.exclude_aws_asg_resources)
+        elif args.action == "scale-up":
+            await scale_up(k8s_client, batch_client, k8s_semaphore, autoscaling_client, ssm_client)
+    logger.info("Script execution finished!")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())